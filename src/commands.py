@@ -57,10 +57,11 @@ class LLMCommands(commands.GroupCog, name="llm"):
             List[app_commands.Choice[str]]: A list of autocomplete choices.
         """
         llm_names = await self.get_llm_names(interaction)
+        current = current.lower()
         return [
             app_commands.Choice(name=name, value=name)
             for name in llm_names
-            if current.lower() in name.lower()
+            if current in name.lower()
         ]
 
     async def autocomplete_message_formatter(
@@ -76,10 +77,11 @@ class LLMCommands(commands.GroupCog, name="llm"):
             List[app_commands.Choice[str]]: A list of autocomplete choices.
         """
         formatter_names = list(formatters.keys())
+        current = current.lower()
         return [
             app_commands.Choice(name=name, value=name)
             for name in formatter_names
-            if current.lower() in name.lower()
+            if current in name.lower()
         ]
 
     @app_commands.command()
@@ -329,13 +331,6 @@ class LLMCommands(commands.GroupCog, name="llm"):
 
         async with Session() as session:
             llm_service = LLMService(session)
-            llm = await llm_service.get_by_name(name, interaction.guild_id)
-            if not llm:
-                embed = Embed(title="Error Modifying LLM", color=discord.Color.red())
-                embed.description = f"LLM '{name}' not found in this guild."
-                await interaction.followup.send(embed=embed)
-                return
-
             update_data = LLMUpdate(
                 **{
                     key: value
@@ -365,7 +360,13 @@ class LLMCommands(commands.GroupCog, name="llm"):
             )
 
             try:
-                updated_llm = await llm_service.update(llm, update_data)
+                updated_llm = await llm_service.update_by_name(name, interaction.guild_id, update_data)
+                if updated_llm is None:
+                    embed = Embed(title="Error Modifying LLM", color=discord.Color.red())
+                    embed.description = f"LLM '{name}' not found in this guild."
+                    await interaction.followup.send(embed=embed)
+                    return
+
                 embed = Embed(title="LLM Modified", color=discord.Color.green())
                 embed.add_field(name="Name", value=updated_llm.name, inline=False)
                 if llm_name:
@@ -444,15 +445,6 @@ class LLMCommands(commands.GroupCog, name="llm"):
                 await interaction.followup.send(embed=embed)
                 return
 
-            existing_llm = await llm_service.get_by_name(new_name, interaction.guild_id)
-            if existing_llm:
-                embed = Embed(title="Error Copying LLM", color=discord.Color.red())
-                embed.description = (
-                    f"An LLM with the name '{new_name}' already exists in this guild."
-                )
-                await interaction.followup.send(embed=embed)
-                return
-
             try:
                 new_llm = await llm_service.copy_llm(source_llm, new_name)
                 embed = Embed(title="LLM Copied", color=discord.Color.green())
@@ -9,4 +9,19 @@ ROOT_DIR = Path(__file__).parent.parent.resolve()
 LOG_DIR = ROOT_DIR / "log"
 
 WEBHOOK_NAME = f"{APP_NAME} Proxy Webhook"
-MAX_WEBHOOKS_PER_CHANNEL = 15
\ No newline at end of file
+MAX_WEBHOOKS_PER_CHANNEL = 15
+
+# Minimum number of messages to import when scanning a channel for the first time; the scan imports more
+# if an LLM in the guild has a larger message limit. Older messages are never imported, because later scans
+# only look for messages newer than the ones already stored, so raising an LLM's message limit afterwards
+# can't bring them into its context.
+INITIAL_HISTORY_SCAN_LIMIT = 1000
+
+# Number of messages to buffer ahead of the database while scanning channel history (two API pages)
+HISTORY_PREFETCH_MESSAGES = 200
+
+# Maximum number of foreign webhook message authors to remember
+FOREIGN_AUTHOR_CACHE_SIZE = 4096
+
+# Maximum number of rows to look up in one query when syncing many records at once
+SYNC_BATCH_SIZE = 1000
@@ -23,6 +23,10 @@ class ChannelQueue:
 
 channel_queues = defaultdict(ChannelQueue)
 
+# Keyed by (channel ID, LLM ID); at most one response per LLM per channel is in flight, with one more pending
+response_locks: defaultdict[tuple[int, int], asyncio.Lock] = defaultdict(asyncio.Lock)
+pending_responses: set[tuple[int, int]] = set()
+
 
 async def process_message(message: discord.Message):
     async with Session() as session:
@@ -34,6 +38,37 @@ async def process_message(message: discord.Message):
                 await llm_service.respond(llm, message.channel)
 
 
+async def respond_to_ping(llm: LLM, channel: discord.abc.Messageable):
+    """
+    Respond to a ping, coalescing repeated pings of the same LLM in the same channel.
+
+    If the LLM is already generating a response in the channel, a single follow-up response is queued so that
+    it sees the newest messages; any further pings made while that follow-up is waiting are dropped.
+
+    Each response uses its own database session, so several pinged LLMs can respond concurrently.
+
+    Args:
+        llm (LLM): The pinged LLM.
+        channel (discord.abc.Messageable): The channel the LLM was pinged in.
+    """
+    key = (channel.id, llm.id)
+    if key in pending_responses:
+        logger.info(f"Response from {llm.name} already pending in channel {channel.id}, ignoring ping")
+        return
+
+    pending_responses.add(key)
+    lock = response_locks[key]
+    try:
+        async with lock:
+            pending_responses.discard(key)
+            async with Session() as session, channel.typing():
+                await LLMService(session).respond(llm, channel)
+    finally:
+        # Drop the lock once nothing holds or waits for it, so locks don't pile up for every pair ever pinged
+        if key not in pending_responses and not lock.locked():
+            response_locks.pop(key, None)
+
+
 async def on_message(message: discord.Message):
     """
     Called when a message is received.
@@ -76,27 +111,29 @@ async def on_message(message: discord.Message):
         # Check if the message replies to another message
         if message.reference is not None and message.reference.message_id is not None:
             other_msg_id: int = message.reference.message_id
-            replied_to_message = await channel.fetch_message(other_msg_id)
+            replied_to_message = message.reference.resolved
+            if not isinstance(replied_to_message, discord.Message):
+                replied_to_message = await message_service.fetch_discord_message(channel, other_msg_id)
             replied_to_llm = await llm_service.get_by_message(replied_to_message)
             if replied_to_llm is not None:
                 pinged_llms.add(replied_to_llm)
 
-        for llm in llms:
-            if await llm_service.mentioned_in_message(llm, message):
+        # LLMs are pinged with a literal "@name", so messages without an "@" can't ping anyone
+        if "@" in message.content:
+            for llm in await llm_service.get_mentioned(llms, message):
                 pinged_llms.add(llm)
                 logger.info(f"Pinged {llm.name}")
 
-        if pinged_llms:
-            for llm in pinged_llms:
-                async with channel.typing():
-                    await llm_service.respond(llm, channel)
-        else:
+        if not pinged_llms:
             try:
                 channel_queue.queue.put_nowait(message)
             except asyncio.QueueFull:
                 logger.info(f"Queue full for channel {channel.id}, ignoring message")
                 return
 
+    if pinged_llms:
+        await asyncio.gather(*(respond_to_ping(llm, channel) for llm in pinged_llms))
+
     async with channel_queue.lock:
         while not channel_queue.queue.empty():
             queued_message = await channel_queue.queue.get()
@@ -2,14 +2,21 @@ import asyncio
 import logging
 import logging.handlers
 import os
+import queue
 import sys
 
 from src.commands import LLMCommands
 from src.config import config
 from src.event_handlers import register_event_handlers
-from src.health_check import start_health_check_server
+from src.health_check import health_check, start_health_check_server
+from src.services.http import close_http_session, install_completion_client
 from src.services.discord_client import bot
 
+try:
+    import uvloop
+except ImportError:  # uvloop does not support Windows
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,8 +29,12 @@ async def main():
         logging.StreamHandler(sys.stdout),
         logging.handlers.RotatingFileHandler("log/nexari.log", maxBytes=1024 * 1024, backupCount=10, encoding="utf-8"),
     ]
+    # Records are formatted on the event loop, but written to stdout and disk from a listener thread
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+    log_listener.start()
     logging.basicConfig(
-        handlers=handlers,
+        handlers=[logging.handlers.QueueHandler(log_queue)],
         level=logging.INFO,
         style="{",
         format="[{asctime}] {levelname} ({name}): {message}",
@@ -38,14 +49,25 @@ async def main():
     await start_health_check_server(bot)
     logger.info("Health check server started")
 
+    install_completion_client()
+
     register_event_handlers(bot)
     await bot.add_cog(LLMCommands(bot))
-    async with bot:
-        await bot.start(config.bot_token)
+    try:
+        async with bot:
+            await bot.start(config.bot_token)
+    finally:
+        await health_check.stop()
+        await close_http_session()
+        # Log before stopping the listener; records queued after it stops are never written
+        logger.info("Bot stopped")
+        log_listener.stop()
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run = uvloop.run if uvloop is not None else asyncio.run
+        run(main())
     except KeyboardInterrupt:
-        logger.info("Bot stopped")
+        # The shutdown was already logged by main
+        pass
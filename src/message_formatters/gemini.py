@@ -1,4 +1,3 @@
-import re
 from typing import Optional, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -31,10 +30,9 @@ class GeminiMessageFormatter(InstructMessageFormatter):
         current_content = []
 
         messages = [message for message in messages if message.content]
+        usernames = await message_service.author_names(messages)
 
-        for message in messages:
-            username = await message_service.author_name(message)
-
+        for message, username in zip(messages, usernames):
             if (
                 message.llm_id and message.llm_id == llm.id
             ):  # If the message is from Gemini
@@ -51,7 +49,7 @@ class GeminiMessageFormatter(InstructMessageFormatter):
                         current_content = []
                     current_role = "assistant"
                 formatted_messages.append(
-                    LiteLLMMessage(role="assistant", content=message.content)
+                    LiteLLMMessage.model_construct(role="assistant", content=message.content)
                 )
             else:
                 if current_role == "assistant":
@@ -77,7 +75,7 @@ class GeminiMessageFormatter(InstructMessageFormatter):
 
     async def parse_messages(self, response: str) -> ParseResponse:
         # Remove the closing </msg> tag if present
-        response = re.sub(r"</msg>", "", response)
+        response = response.replace("</msg>", "")
 
         return ParseResponse(
             complete_message=response,
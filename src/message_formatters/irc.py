@@ -2,12 +2,10 @@ import re
 from itertools import chain
 from typing import Optional
 
-from discord import NotFound
 from regex import regex
 
 from src.db.models import Message, LLM
 from src.services.channel import ChannelService
-from src.services.discord_client import bot
 from src.services.message import MessageService
 from src.types.litellm_message import LiteLLMMessage
 from src.types.message_formatter import ComboMessageFormatter, ParseResponse
@@ -27,24 +25,10 @@ class IRCMessageFormatter(ComboMessageFormatter):
             formatted_messages.append(
                 LiteLLMMessage(role="system", content=system_prompt)
             )
-        for message in messages:
-            if not message.content:
-                continue
-
-            matches = re.finditer(r"<@(?P<user_id>\d+)>", message.content)
-            message_replaced_mentions = message.content
-            for match in matches:
-                user_id = match.group("user_id")
-                try:
-                    user = await bot.fetch_user(user_id)
-                    message_replaced_mentions = message_replaced_mentions.replace(
-                        f"<@{user_id}>", f"@{user.name}"
-                    )
-                except NotFound:
-                    continue
-
-            username = await message_service.author_name(message)
+        messages = [message for message in messages if message.content]
+        usernames = await message_service.author_names(messages)
 
+        for message, username in zip(messages, usernames):
             if message.llm_id:
                 role = (
                     "assistant"
@@ -55,7 +39,7 @@ class IRCMessageFormatter(ComboMessageFormatter):
                 role = "user"
 
             content = f"<{username}> {message.content}"
-            formatted_messages.append(LiteLLMMessage(role=role, content=content))
+            formatted_messages.append(LiteLLMMessage.model_construct(role=role, content=content))
 
         return formatted_messages
 
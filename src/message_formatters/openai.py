@@ -26,12 +26,10 @@ class OpenAIMessageFormatter(InstructMessageFormatter):
                 LiteLLMMessage(role="system", content=system_prompt)
             )
 
-        for message in messages:
-            if not message.content:
-                continue
-
-            name = await message_service.author_name(message)
+        messages = [message for message in messages if message.content]
+        names = await message_service.author_names(messages)
 
+        for message, name in zip(messages, names):
             if message.llm_id:
                 role = (
                     "assistant"
@@ -42,7 +40,7 @@ class OpenAIMessageFormatter(InstructMessageFormatter):
                 role = "user"
 
             formatted_messages.append(
-                LiteLLMMessage(role=role, content=message.content, name=name)
+                LiteLLMMessage.model_construct(role=role, content=message.content, name=name)
             )
 
         return formatted_messages
@@ -1,10 +1,12 @@
+import asyncio
 from datetime import datetime, UTC
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 
 import discord
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from src.const import HISTORY_PREFETCH_MESSAGES, INITIAL_HISTORY_SCAN_LIMIT
 from src.db.models.channel import Channel, ChannelUpdate
 
 
@@ -64,17 +66,21 @@ class ChannelService:
         )
         return list(result.scalars().all())
 
-    async def sync(self, discord_channel: AllowedChannelType) -> Optional[Channel]:
+    async def sync(
+        self, discord_channel: AllowedChannelType, webhooks: Optional[List[discord.Webhook]] = None
+    ) -> Optional[Channel]:
         """
         Synchronize the database channel with the Discord channel.
 
         Args:
             discord_channel (discord.abc.GuildChannel): The Discord channel to sync with.
+            webhooks (Optional[List[discord.Webhook]]): The channel's webhooks, if already fetched.
+                If None, they are fetched from Discord.
 
         Returns:
             Channel: The updated database Channel object, or None if the channel is not of an allowed type.
         """
-        from src.services.message import MessageService
+        from src.services.llm import LLMService
         from src.services.webhook import WebhookService
 
         if not ChannelService.is_allowed_channel_type(discord_channel):
@@ -96,31 +102,85 @@ class ChannelService:
                 await self.sync(thread)
 
         # Update webhooks
-        if hasattr(discord_channel, "webhooks"):
+        if webhooks is None and hasattr(discord_channel, "webhooks"):
+            webhooks = await discord_channel.webhooks()
+        if webhooks:
             webhook_service = WebhookService(session=self.session)
-            for webhook in await discord_channel.webhooks():
+            for webhook in webhooks:
                 await webhook_service.sync(webhook)
 
         # Update messages
-        if hasattr(discord_channel, "history"):
-            message_service = MessageService(session=self.session)
-            try:
-                async for message in discord_channel.history(
-                    limit=None, after=db_channel.scanned_up_to, oldest_first=True
-                ):
-                    await message_service.sync(message)
-                    db_channel.scanned_up_to = (
-                        max(db_channel.scanned_up_to, message.created_at)
-                        if db_channel.scanned_up_to is not None
-                        else message.created_at
-                    )
-            except discord.Forbidden as e:
-                pass
+        if hasattr(discord_channel, "history") and ChannelService.has_unscanned_messages(discord_channel, db_channel):
+            if db_channel.scanned_up_to is None:
+                # On a channel's first scan, only the most recent messages can end up in an LLM's context,
+                # so import enough of them to fill the largest context in the guild
+                llm_service = LLMService(session=self.session)
+                max_message_limit = await llm_service.get_max_message_limit(discord_channel.guild.id)
+                history = discord_channel.history(
+                    limit=max(INITIAL_HISTORY_SCAN_LIMIT, max_message_limit or 0)
+                )
+            else:
+                history = discord_channel.history(limit=None, after=db_channel.scanned_up_to, oldest_first=True)
+
+            await self.import_history(db_channel, history)
 
         await self.session.commit()
 
         return db_channel
 
+    async def import_history(self, db_channel: Channel, history: AsyncIterator[discord.Message]) -> None:
+        """
+        Store messages from a channel's history and record how far the channel has been scanned.
+
+        A first scan reads newest-first, so the channel is only marked as scanned once the whole scan has
+        finished; otherwise an interrupted scan would look complete and the rest of it would never be imported.
+        Later scans read oldest-first, so they advance the mark with every message.
+
+        Args:
+            db_channel (Channel): The database channel the history belongs to.
+            history (AsyncIterator[discord.Message]): The channel's history to import.
+        """
+        from src.services.message import MessageService
+
+        message_service = MessageService(session=self.session)
+        first_scan = db_channel.scanned_up_to is None
+        newest_created_at: Optional[datetime] = db_channel.scanned_up_to
+
+        # Fetch history pages in the background while messages are written to the database,
+        # so Discord round-trips overlap with database round-trips
+        history_queue: asyncio.Queue[Optional[discord.Message]] = asyncio.Queue(
+            maxsize=HISTORY_PREFETCH_MESSAGES
+        )
+
+        async def fetch_history() -> None:
+            try:
+                async for discord_message in history:
+                    await history_queue.put(discord_message)
+            finally:
+                # Once cancelled, nothing drains the queue any more, so waiting to put the end-of-history
+                # marker into a full queue would block forever
+                if not asyncio.current_task().cancelling():
+                    await history_queue.put(None)
+
+        fetch_task = asyncio.create_task(fetch_history())
+        try:
+            while (message := await history_queue.get()) is not None:
+                await message_service.sync(message)
+                newest_created_at = (
+                    max(newest_created_at, message.created_at)
+                    if newest_created_at is not None
+                    else message.created_at
+                )
+                if not first_scan:
+                    db_channel.scanned_up_to = newest_created_at
+            await fetch_task
+            if first_scan:
+                db_channel.scanned_up_to = newest_created_at
+        except discord.Forbidden as e:
+            pass
+        finally:
+            fetch_task.cancel()
+
     @staticmethod
     def is_allowed_channel_type(
         channel: discord.abc.GuildChannel | discord.Thread,
@@ -129,6 +189,26 @@ class ChannelService:
             return False
         return True
 
+    @staticmethod
+    def has_unscanned_messages(discord_channel: AllowedChannelType, db_channel: Channel) -> bool:
+        """
+        Determine whether a channel may contain messages newer than the last history scan.
+
+        Discord reports the ID of a channel's latest message, and message IDs encode their creation time, so
+        an up-to-date channel can be detected without requesting an (empty) page of history.
+
+        Args:
+            discord_channel (AllowedChannelType): The Discord channel to check.
+            db_channel (Channel): The database record for the channel.
+
+        Returns:
+            bool: False if the channel is known to be fully scanned, True otherwise.
+        """
+        last_message_id = getattr(discord_channel, "last_message_id", None)
+        if db_channel.scanned_up_to is None or last_message_id is None:
+            return True
+        return discord.utils.snowflake_time(last_message_id) > db_channel.scanned_up_to
+
     @staticmethod
     def has_threads(channel: discord.abc.GuildChannel | discord.Thread) -> bool:
         return isinstance(channel, discord.TextChannel) or isinstance(
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import Optional, List
 
 import discord
@@ -70,13 +71,25 @@ class GuildService:
 
         # Update users
         user_service = UserService(self.session)
-        for user in discord_guild.members:
-            await user_service.sync(user)
-
-        # Update channels
+        await user_service.sync_many(discord_guild.members)
+
+        # Fetch every webhook in the guild with one request, rather than one request per channel
+        webhooks_by_channel: Optional[defaultdict[int, List[discord.Webhook]]] = defaultdict(list)
+        try:
+            for webhook in await discord_guild.webhooks():
+                webhooks_by_channel[webhook.channel_id].append(webhook)
+        except discord.Forbidden:
+            # Without guild-wide webhook permissions, fall back to fetching each channel's webhooks
+            webhooks_by_channel = None
+
+        # Update channels; loading the guild's channels up front lets each channel's sync find its
+        # database record in the session instead of querying for it. The session's identity map only holds
+        # weak references, so the list must stay alive until every channel has been synced.
         channel_service = ChannelService(self.session)
+        db_channels = await channel_service.get_by_guild(discord_guild.id)
         for channel in discord_guild.channels:
-            await channel_service.sync(channel)
+            webhooks = webhooks_by_channel[channel.id] if webhooks_by_channel is not None else None
+            await channel_service.sync(channel, webhooks=webhooks)
 
         await self.session.commit()
 
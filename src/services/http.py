@@ -0,0 +1,53 @@
+from typing import Optional
+
+import aiohttp
+import httpx
+import litellm
+
+_session: Optional[aiohttp.ClientSession] = None
+_completion_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the process-wide HTTP session, creating it on first use.
+
+    Sharing one session keeps connections to inference providers alive between requests, so each completion
+    doesn't pay for a fresh TCP and TLS handshake.
+
+    Returns:
+        aiohttp.ClientSession: The shared HTTP session.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+        _session = aiohttp.ClientSession(connector=connector)
+    return _session
+
+
+def install_completion_client() -> None:
+    """
+    Create the process-wide HTTP client and install it as litellm's async session.
+
+    litellm only passes this session to its OpenAI-style clients, so completions through OpenAI-compatible
+    APIs share one connection pool; other providers keep their own connections.
+    """
+    global _completion_client
+    if _completion_client is None or _completion_client.is_closed:
+        _completion_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(600, connect=10),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    litellm.aclient_session = _completion_client
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session and litellm client, if they were opened."""
+    global _session, _completion_client
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    if _completion_client is not None and not _completion_client.is_closed:
+        await _completion_client.aclose()
+    _completion_client = None
+    litellm.aclient_session = None
@@ -1,10 +1,14 @@
+import asyncio
 import logging
 from typing import Optional, List, Any
 
 import aiohttp
 import discord
+import orjson
 from litellm import acompletion
 from litellm.types.utils import ModelResponse
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -12,8 +16,10 @@ from src import message_formatters
 from src.db.models.llm import LLM, LLMCreate, LLMUpdate
 from src.message_formatters import get_message_formatter
 from src.services.channel import AllowedChannelType
+from src.services.db import Session
 from src.services.discord_client import bot
 from src.services.guild import GuildService
+from src.services.http import get_http_session
 from src.services.message import MessageService
 from src.services.webhook import WebhookService
 from src.types.litellm_message import LiteLLMMessage
@@ -22,9 +28,36 @@ from src.types.message_formatter import (
     InstructMessageFormatter,
     SimulatorMessageFormatter,
 )
+from src.util import find_mentions
 
 logger = logging.getLogger(__name__)
 
+# Optional sampling settings on the LLM model that are forwarded to the completion API when set
+SAMPLING_PARAMETERS = (
+    "temperature",
+    "top_p",
+    "top_k",
+    "frequency_penalty",
+    "presence_penalty",
+    "repetition_penalty",
+    "min_p",
+    "top_a",
+)
+
+# Strong references to fire-and-forget tasks, so they aren't garbage collected before finishing
+background_tasks: set[asyncio.Task] = set()
+
+
+def _finish_background_task(task: asyncio.Task) -> None:
+    background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task failed", exc_info=task.exception())
+
+
+def _validate_llm_values(values: dict[str, Any]) -> None:
+    # Constructing the model runs its validators, which INSERT and UPDATE statements would bypass
+    LLM(**values)
+
 
 class LLMService:
     def __init__(self, session: AsyncSession):
@@ -49,6 +82,19 @@ class LLMService:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_max_message_limit(self, guild_id: int) -> Optional[int]:
+        """
+        Get the largest message limit of any LLM in a guild, including its simulator and disabled LLMs.
+
+        Args:
+            guild_id (int): The ID of the guild.
+
+        Returns:
+            Optional[int]: The largest message limit, or None if the guild has no LLMs.
+        """
+        stmt = select(func.max(LLM.message_limit)).where(LLM.guild_id == guild_id)
+        return await self.session.scalar(stmt)
+
     async def get_by_message(self, message: discord.Message) -> Optional[LLM]:
         webhook_service = WebhookService(session=self.session)
 
@@ -65,18 +111,49 @@ class LLMService:
         return await self.get_by_name(name, guild_id)
 
     async def create(self, llm_data: LLMCreate) -> LLM:
-        llm = LLM(**llm_data.model_dump())
-        self.session.add(llm)
+        values = llm_data.model_dump()
+        _validate_llm_values(values)
+
+        # Insert and detect duplicate names in one statement, rather than checking for the name first
+        stmt = (
+            pg_insert(LLM)
+            .values(**values)
+            .on_conflict_do_nothing(constraint="uq_name_guild_id")
+            .returning(LLM)
+        )
+        llm = await self.session.scalar(stmt)
+        if llm is None:
+            raise ValueError(f"An LLM with the name '{llm_data.name}' already exists in this guild.")
         await self.session.commit()
         return llm
 
-    async def update(self, llm: LLM, update_data: LLMUpdate) -> LLM:
-        for key, value in update_data.model_dump(exclude_unset=True).items():
-            if key == "message_formatter":
-                if value not in message_formatters.formatters:
-                    raise ValueError(f"Invalid message formatter: {value}")
+    async def update_by_name(self, name: str, guild_id: int, update_data: LLMUpdate) -> Optional[LLM]:
+        """
+        Update an LLM by name with a single UPDATE ... RETURNING, instead of loading it first.
 
-            setattr(llm, key, value)
+        Args:
+            name (str): The name of the LLM to update.
+            guild_id (int): The ID of the guild the LLM belongs to.
+            update_data (LLMUpdate): The fields to update.
+
+        Returns:
+            Optional[LLM]: The updated LLM, or None if no LLM with that name exists in the guild.
+        """
+        values = update_data.model_dump(exclude_unset=True)
+        if "message_formatter" in values and values["message_formatter"] not in message_formatters.formatters:
+            raise ValueError(f"Invalid message formatter: {values['message_formatter']}")
+        if not values:
+            return await self.get_by_name(name, guild_id)
+
+        _validate_llm_values(values)
+
+        stmt = (
+            update(LLM)
+            .where(LLM.name == name, LLM.guild_id == guild_id)
+            .values(**values)
+            .returning(LLM)
+        )
+        llm = await self.session.scalar(stmt)
         await self.session.commit()
         return llm
 
@@ -89,20 +166,13 @@ class LLMService:
     ) -> ModelResponse:
         try:
             sampling_config = {
-                "temperature": llm.temperature,
-                "top_p": llm.top_p,
-                "top_k": llm.top_k,
-                "frequency_penalty": llm.frequency_penalty,
-                "presence_penalty": llm.presence_penalty,
-                "repetition_penalty": llm.repetition_penalty,
-                "min_p": llm.min_p,
-                "top_a": llm.top_a,
+                key: val for key in SAMPLING_PARAMETERS if (val := getattr(llm, key)) is not None
             }
             response = await acompletion(
                 model=llm.llm_name,
                 messages=messages,
                 max_tokens=llm.max_tokens,
-                **{key: val for key, val in sampling_config.items() if val is not None},
+                **sampling_config,
                 api_base=llm.api_base,
                 api_key=llm.api_key,
                 stop=[],
@@ -131,32 +201,32 @@ class LLMService:
             "stop": stop_words,
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=data) as response:
-                for attempt in range(3):
-                    if response.status == 200:
-                        try:
-                            result = await response.json()
-                            if result:
-                                return result
-                            else:
-                                logger.warning(
-                                    f"Empty simulator response received. Attempt {attempt + 1} of 3."
-                                )
-                                logger.warning(await response.text())
-                        except aiohttp.client_exceptions.ClientPayloadError as e:
+        http_session = get_http_session()
+        async with http_session.post(url, headers=headers, json=data) as response:
+            for attempt in range(3):
+                if response.status == 200:
+                    try:
+                        result = await response.json(loads=orjson.loads)
+                        if result:
+                            return result
+                        else:
                             logger.warning(
-                                f"ClientPayloadError occurred: {e}. Attempt {attempt + 1} of 3."
+                                f"Empty simulator response received. Attempt {attempt + 1} of 3."
                             )
-
-                        if attempt < 2:
-                            continue
-                    else:
-                        raise Exception(
-                            f"Error {response.status}: {await response.text()}"
+                            logger.warning(await response.text())
+                    except aiohttp.client_exceptions.ClientPayloadError as e:
+                        logger.warning(
+                            f"ClientPayloadError occurred: {e}. Attempt {attempt + 1} of 3."
                         )
 
-                raise ValueError("Failed to get a valid response after 3 attempts")
+                    if attempt < 2:
+                        continue
+                else:
+                    raise Exception(
+                        f"Error {response.status}: {await response.text()}"
+                    )
+
+            raise ValueError("Failed to get a valid response after 3 attempts")
 
     async def copy_llm(self, llm: LLM, new_name: str) -> LLM:
         new_llm_data = {
@@ -218,7 +288,9 @@ class LLMService:
         history = await message_service.history(channel.id, limit=llm.message_limit)
         guild = await guild_service.get(channel.guild.id)
 
-        is_thread = isinstance(channel, discord.Thread)
+        # The stored webhook doesn't depend on the response, so look it up while the response is being generated.
+        # Creating a missing webhook is left to send_as_llm, so it only happens once something is posted.
+        webhook_task = asyncio.create_task(LLMService.find_channel_webhook(channel))
 
         try:
             message_formatter = message_formatters.get_message_formatter(
@@ -269,24 +341,9 @@ class LLMService:
                 # If no usernames were found, assume it's from this LLM
                 response_username = llm.name
 
-            webhook_service = WebhookService(self.session)
-            webhook = await webhook_service.get_or_create_by_channel(channel)
-
             if response_username == llm.name:
                 # If the message is from this LLM, send it
-                discord_webhook = await bot.fetch_webhook(webhook.id)
-                for message in response_messages:
-                    if is_thread:
-                        await discord_webhook.send(
-                            message,
-                            thread=channel,
-                            username=llm.name,
-                            avatar_url=llm.avatar_url,
-                        )
-                    else:
-                        await discord_webhook.send(
-                            message, username=llm.name, avatar_url=llm.avatar_url
-                        )
+                await self.send_as_llm(llm, channel, response_messages, await webhook_task)
                 logger.info(
                     f"Msg in channel {channel.id} from {response_username}: {parse_response.complete_message}"
                 )
@@ -306,33 +363,86 @@ class LLMService:
                 # Or, if it's a human's username, mention them
                 member = channel.guild.get_member_named(response_username)
                 if member is not None:
-                    discord_webhook = await bot.fetch_webhook(webhook.id)
-                    await discord_webhook.send(
-                        f"<@{member.id}>", username=llm.name, avatar_url=llm.avatar_url
-                    )
+                    await self.send_as_llm(llm, channel, [f"<@{member.id}>"], await webhook_task)
                     return
 
                 # Otherwise, if no matching LLM or user found, send the message as is
-                discord_webhook = await bot.fetch_webhook(webhook.id)
-                for message in response_messages:
-                    await discord_webhook.send(
-                        message, username=llm.name, avatar_url=llm.avatar_url
-                    )
+                await self.send_as_llm(llm, channel, response_messages, await webhook_task)
                 logger.warning(
                     f"{llm.name} sent a message with unknown username: {response_username}"
                 )
 
         except Exception as e:
             logger.exception(f"Error in respond method: {str(e)}")
+        finally:
+            # Nothing may have been sent, so make sure the lookup is finished and its errors are collected.
+            # It only reads, so cancelling it can't leave anything half-created.
+            webhook_task.cancel()
+            await asyncio.gather(webhook_task, return_exceptions=True)
+
+    @staticmethod
+    async def find_channel_webhook(channel: AllowedChannelType) -> Optional[discord.Webhook]:
+        """
+        Look up the stored webhook used to post in a channel, without creating one.
+
+        The lookup only reads, on its own database session, so it can run concurrently with other work on a
+        response and be cancelled at any point.
+
+        Args:
+            channel (AllowedChannelType): The channel (or thread) to post in.
+
+        Returns:
+            Optional[discord.Webhook]: The channel's webhook if one is stored, None otherwise.
+        """
+        async with Session() as session:
+            webhook = await WebhookService(session).get_by_channel(channel.id)
+        if webhook is None:
+            return None
+        # The stored token is enough to post through the webhook, so skip fetching it from Discord
+        return discord.Webhook.partial(webhook.id, webhook.token, client=bot)
+
+    async def send_as_llm(
+        self,
+        llm: LLM,
+        channel: AllowedChannelType,
+        messages: List[str],
+        discord_webhook: Optional[discord.Webhook] = None,
+    ) -> None:
+        """
+        Post messages in a channel through its webhook, using the LLM's name and avatar.
 
-    async def mentioned_in_message(self, llm: LLM, message: discord.Message) -> bool:
-        # Self-mentions don't count
+        Args:
+            llm (LLM): The LLM to post as.
+            channel (AllowedChannelType): The channel (or thread) to post in.
+            messages (List[str]): The messages to post, in order.
+            discord_webhook (Optional[discord.Webhook]): The channel's webhook, if already looked up.
+        """
+        if discord_webhook is None:
+            webhook_service = WebhookService(self.session)
+            webhook = await webhook_service.get_or_create_by_channel(channel)
+            discord_webhook = discord.Webhook.partial(webhook.id, webhook.token, client=bot)
+
+        thread = channel if isinstance(channel, discord.Thread) else discord.utils.MISSING
+        for message in messages:
+            await discord_webhook.send(message, thread=thread, username=llm.name, avatar_url=llm.avatar_url)
+
+    async def get_mentioned(self, llms: List[LLM], message: discord.Message) -> List[LLM]:
+        """
+        Find which of the given LLMs are mentioned in a message.
+
+        Args:
+            llms (List[LLM]): The LLMs to check for.
+            message (discord.Message): The message to check.
+
+        Returns:
+            List[LLM]: The mentioned LLMs, in the order they were given.
+        """
+        # Self-mentions don't count; the sender is the same for every LLM, so look it up once
         sender = await self.get_by_message(message)
-        if sender is not None and sender.id == llm.id:
-            return False
+        sender_id = sender.id if sender is not None else None
 
-        mentioned = f"@{llm.name.lower()}" in message.content.lower()
-        return mentioned
+        mentioned_names = find_mentions([llm.name for llm in llms], message.content)
+        return [llm for llm in llms if llm.id != sender_id and llm.name in mentioned_names]
 
     async def get_next_participant(self, channel: discord.TextChannel) -> Optional[LLM]:
         guild = channel.guild
@@ -360,7 +470,6 @@ class LLMService:
         )
         llms_in_guild = await llm_service.get_by_guild(guild.id, enabled=True)
         last_speaker = await message_service.author_name(messages[-1])
-        simulator = await llm_service.get_simulator(guild.id)
 
         prompt = await message_formatter.format_simulator(
             llm=simulator,
@@ -386,10 +495,11 @@ class LLMService:
                 escaped_response_str = response_str.replace(
                     "```", f"`{zero_width_space}`{zero_width_space}`"
                 )
-                await simulator_channel.send(
-                    content=f"{await message_service.jump_url(messages[-1])}:\n```\n{escaped_response_str}\n```",
-                    suppress_embeds=True,
-                )
+                content = f"{await message_service.jump_url(messages[-1])}:\n```\n{escaped_response_str}\n```"
+                # The dump is purely informational, so don't hold up the next speaker on it
+                send_task = asyncio.create_task(simulator_channel.send(content=content, suppress_embeds=True))
+                background_tasks.add(send_task)
+                send_task.add_done_callback(_finish_background_task)
 
         next_user = await message_formatter.parse_next_user(response_str, last_speaker)
         if next_user is None:
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from typing import Optional, List
 from wsgiref.util import application_uri
 
@@ -5,12 +6,16 @@ import discord
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from src.const import FOREIGN_AUTHOR_CACHE_SIZE
 from src.db.models.message import Message, MessageUpdate
 from src.services.discord_client import bot
 
 from src.services.user import UserService
 from src.services.webhook import WebhookService
 
+# Author names of messages sent by webhooks that don't belong to Nexari, keyed by message ID, least recent first
+foreign_author_names: OrderedDict[int, str] = OrderedDict()
+
 
 class MessageService:
     def __init__(self, session: AsyncSession):
@@ -41,9 +46,6 @@ class MessageService:
         user_service = UserService(self.session)
         await user_service.get_or_create(message.author)
 
-        channel_service = ChannelService(self.session)
-        await channel_service.get_or_create(message.channel)
-
         db_message = Message(
             id=message.id,
             content=message.content,
@@ -100,8 +102,9 @@ class MessageService:
             .limit(limit)
         )
         result = await self.session.execute(stmt)
-        messages = result.scalars().all()
-        return list(reversed(messages))  # Reverse to get chronological order
+        messages = list(result.scalars())
+        messages.reverse()  # Reverse in place to get chronological order
+        return messages
 
     async def sync(self, discord_message: discord.Message) -> Message:
         """
@@ -113,7 +116,10 @@ class MessageService:
         Returns:
             Message: The updated database Message object.
         """
-        db_message = await self.get_or_create(discord_message)
+        db_message = await self.get(discord_message.id)
+        if db_message is None:
+            # A freshly created message already reflects the Discord message
+            return await self.create(discord_message)
 
         # Ensure author exists
         user_service = UserService(self.session)
@@ -140,9 +146,75 @@ class MessageService:
             llm = await llm_service.get(message.llm_id)
             return llm.name
         else:  # from foreign webhook
-            channel = bot.get_channel(message.channel_id)
-            discord_message = await channel.fetch_message(message.id)
-            return discord_message.author.name
+            # A message's author never changes, so remember it instead of asking Discord every turn
+            name = foreign_author_names.get(message.id)
+            if name is None:
+                channel = bot.get_channel(message.channel_id)
+                discord_message = await self.fetch_discord_message(channel, message.id)
+                name = discord_message.author.name
+                foreign_author_names[message.id] = name
+                if len(foreign_author_names) > FOREIGN_AUTHOR_CACHE_SIZE:
+                    foreign_author_names.popitem(last=False)
+            else:
+                foreign_author_names.move_to_end(message.id)
+            return name
+
+    async def author_names(self, messages: List[Message]) -> List[str]:
+        """
+        Resolve the author names of several messages at once.
+
+        Users and LLMs are looked up with one query each rather than one query per message.
+
+        Args:
+            messages (List[Message]): The messages to resolve author names for.
+
+        Returns:
+            List[str]: The author name of each message, in the same order as the messages.
+        """
+        from src.db.models.llm import LLM
+        from src.db.models.user import User
+
+        user_ids = {message.user_id for message in messages if message.is_from_user}
+        llm_ids = {message.llm_id for message in messages if not message.is_from_user and message.is_from_nexari_llm}
+
+        user_names: dict[int, str] = {}
+        if user_ids:
+            result = await self.session.execute(select(User.id, User.name).where(User.id.in_(user_ids)))
+            user_names = dict(result.tuples().all())
+
+        llm_names: dict[int, str] = {}
+        if llm_ids:
+            result = await self.session.execute(select(LLM.id, LLM.name).where(LLM.id.in_(llm_ids)))
+            llm_names = dict(result.tuples().all())
+
+        names = []
+        for message in messages:
+            if message.is_from_user:
+                name = user_names.get(message.user_id)
+            elif message.is_from_nexari_llm:
+                name = llm_names.get(message.llm_id)
+            else:
+                name = None
+            names.append(name if name is not None else await self.author_name(message))
+        return names
+
+    @staticmethod
+    async def fetch_discord_message(channel: discord.abc.Messageable, message_id: int) -> discord.Message:
+        """
+        Fetch a Discord message, serving it from the client's message cache when possible.
+
+        Args:
+            channel (discord.abc.Messageable): The channel the message was sent in.
+            message_id (int): The ID of the message to fetch.
+
+        Returns:
+            discord.Message: The Discord message.
+        """
+        # Recent messages are the most likely hits, so search the cache newest-first
+        cached_message = discord.utils.get(reversed(bot.cached_messages), id=message_id)
+        if cached_message is not None:
+            return cached_message
+        return await channel.fetch_message(message_id)
 
     async def jump_url(self, message: Message) -> str:
         from src.services.channel import ChannelService
@@ -3,6 +3,8 @@ from typing import Optional, List
 import discord
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+
+from src.const import SYNC_BATCH_SIZE
 from src.db.models.user import User, UserCreate, UserUpdate
 
 class UserService:
@@ -58,3 +60,37 @@ class UserService:
         await self.session.commit()
 
         return db_user
+
+    async def sync_many(self, discord_users: List[discord.User]) -> List[User]:
+        """
+        Synchronize several database users with their Discord users at once.
+
+        Existing users are loaded with one query per batch and all changes are committed together, rather than
+        querying and committing once per user.
+
+        Args:
+            discord_users (List[discord.User]): The Discord users to sync with.
+
+        Returns:
+            List[User]: The updated database User objects, in the same order as the Discord users.
+        """
+        db_users: dict[int, User] = {}
+        for start in range(0, len(discord_users), SYNC_BATCH_SIZE):
+            user_ids = [discord_user.id for discord_user in discord_users[start:start + SYNC_BATCH_SIZE]]
+            result = await self.session.execute(select(User).where(User.id.in_(user_ids)))
+            db_users.update((db_user.id, db_user) for db_user in result.scalars())
+
+        synced_users = []
+        for discord_user in discord_users:
+            db_user = db_users.get(discord_user.id)
+            if db_user is None:
+                db_user = User(id=discord_user.id, name=discord_user.name)
+                self.session.add(db_user)
+                db_users[discord_user.id] = db_user
+            else:
+                # Update user properties
+                db_user.name = discord_user.name
+            synced_users.append(db_user)
+        await self.session.commit()
+
+        return synced_users
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Optional
 
@@ -12,6 +13,9 @@ from src.services.discord_client import bot
 
 logger = logging.getLogger(__name__)
 
+# Webhook creations in flight, keyed by the ID of the channel that will own the webhook
+pending_creations: dict[int, asyncio.Task[Webhook]] = {}
+
 
 class WebhookService:
     def __init__(self, session: AsyncSession):
@@ -68,9 +72,45 @@ class WebhookService:
     async def get_or_create_by_channel(self, channel: AllowedChannelType) -> Webhook:
         db_webhook = await self.get_by_channel(channel.id)
         if db_webhook is None:
-            db_webhook = await self.create_by_channel(channel)
+            db_webhook = await WebhookService.create_by_channel_once(channel)
         return db_webhook
 
+    @staticmethod
+    async def create_by_channel_once(channel: AllowedChannelType) -> Webhook:
+        """
+        Create the webhook for a channel, sharing the creation with any concurrent callers for the same channel.
+
+        Several LLMs can respond in a channel at once, and without this each would create its own webhook.
+        The creation runs on its own database session and is shielded, so cancelling one caller doesn't
+        interrupt it between creating the Discord webhook and storing it.
+
+        Args:
+            channel (AllowedChannelType): The channel (or thread) to create the webhook for.
+
+        Returns:
+            Webhook: The created webhook.
+        """
+        from src.services.db import Session
+
+        # Threads post through their parent channel's webhook
+        owner_id = channel.parent.id if hasattr(channel, "parent") else channel.id
+
+        creation = pending_creations.get(owner_id)
+        if creation is None:
+            async def create() -> Webhook:
+                async with Session() as session:
+                    webhook_service = WebhookService(session)
+                    # A creation that finished just before this one started has already stored the webhook
+                    db_webhook = await webhook_service.get_by_channel(channel.id)
+                    if db_webhook is None:
+                        db_webhook = await webhook_service.create_by_channel(channel)
+                    return db_webhook
+
+            creation = asyncio.create_task(create())
+            pending_creations[owner_id] = creation
+            creation.add_done_callback(lambda _: pending_creations.pop(owner_id, None))
+        return await asyncio.shield(creation)
+
     async def delete(self, *webhooks: Webhook) -> None:
         for webhook in webhooks:
             await self.session.delete(webhook)
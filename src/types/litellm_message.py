@@ -6,6 +6,9 @@ from pydantic import BaseModel
 class LiteLLMMessage(BaseModel):
     """
     A message in the LiteLLM format.
+
+    Formatters build one of these per history message with `model_construct`, skipping validation, since
+    every field comes from strings already stored in the database.
     """
 
     role: str
@@ -1,7 +1,6 @@
 import textwrap
 from abc import ABC, abstractmethod
-from itertools import cycle
-from typing import List, Literal, Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -52,45 +51,29 @@ class BaseMessageFormatter(ABC):
             List[str]: A list of message chunks.
         """
 
-        class CharBlock(BaseModel):
-            content: str
-            block_type: Literal["text", "code"]
-
-        char_blocks = (
-            CharBlock(content=content, block_type=block_type)
-            for content, block_type in zip(
-                content.split("```"), cycle(["text", "code"])
-            )
-            if content
-        )
-
-        blocks = []
-        for block in char_blocks:
-            if block.block_type == "text":
-                block.content = block.content.strip()
-                if block:
-                    blocks.append(block)
-            else:
-                blocks.append(block)
-
         messages = []
-        for block in blocks:
-            if block.block_type == "text":
-                messages.extend(
-                    [
-                        nonempty_message
-                        for paragraph in block.content.split("\n\n")
-                        for message in textwrap.wrap(
+        # Splitting on fences alternates text and code: even-indexed segments are text, odd-indexed are code
+        for index, block_content in enumerate(content.split("```")):
+            if not block_content:
+                continue
+
+            if index % 2 == 0:
+                for paragraph in block_content.strip().split("\n\n"):
+                    # Most paragraphs already fit in one message and don't need to go through textwrap
+                    if len(paragraph) <= DISCORD_MESSAGE_MAX_CHARS:
+                        wrapped = [paragraph]
+                    else:
+                        wrapped = textwrap.wrap(
                             paragraph,
                             width=DISCORD_MESSAGE_MAX_CHARS,
                             expand_tabs=False,
                             replace_whitespace=False,
                         )
-                        if (nonempty_message := message.strip())
-                    ]
-                )
-            elif block.block_type == "code":
-                lines = block.content.split("\n")
+                    messages.extend(
+                        nonempty_message for message in wrapped if (nonempty_message := message.strip())
+                    )
+            else:
+                lines = block_content.split("\n")
 
                 potential_language_marker = None
                 if lines[0] != "":
@@ -105,7 +88,7 @@ class BaseMessageFormatter(ABC):
                 if lines:
                     message_lines = []
                     current_length = 0
-                    for index, line in enumerate(lines):
+                    for line in lines:
                         estimated_length = (
                             current_length + len(line) + len("```\n") + len("\n```") + 1
                         )
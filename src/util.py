@@ -1,4 +1,6 @@
-from typing import Callable, TypeVar, List
+import re
+from functools import lru_cache
+from typing import Callable, TypeVar, List, Set, Tuple
 
 T = TypeVar("T")
 
@@ -38,3 +40,45 @@ def drop_both_ends(predicate: Callable[[T], bool], lst: List[T]) -> List[T]:
             break
 
     return lst[start:end]
+
+
+@lru_cache(maxsize=256)
+def mention_pattern(names: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile the pattern used by find_mentions for a set of names.
+
+    A guild's LLM names rarely change, so the compiled pattern is cached and reused for every message.
+
+    Args:
+        names (Tuple[str, ...]): The names to look for.
+
+    Returns:
+        re.Pattern: A pattern matching every "@", with one optional capturing lookahead per lowercased name.
+    """
+    return re.compile("@" + "".join(f"(?=({re.escape(name.lower())}))?" for name in names))
+
+
+def find_mentions(names: List[str], content: str) -> Set[str]:
+    """
+    Find which names are mentioned as "@name" in a piece of text, ignoring case.
+
+    All names are matched in a single pass over the text. Each name gets its own lookahead, so names that are
+    prefixes of each other are all found: "@bobby" mentions both "bob" and "bobby".
+
+    Args:
+        names (List[str]): The names to look for.
+        content (str): The text to search.
+
+    Returns:
+        Set[str]: The mentioned names, as given in names.
+
+    Example:
+        >>> sorted(find_mentions(["Bob", "Bobby", "Alice"], "hey @bobby"))
+        ['Bob', 'Bobby']
+    """
+    # Sort the names so the same set of names always hits the same cached pattern
+    names = tuple(sorted(set(names)))
+    mentioned = set()
+    for match in mention_pattern(names).finditer(content.lower()):
+        mentioned.update(name for name, group in zip(names, match.groups()) if group is not None)
+    return mentioned
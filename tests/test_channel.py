@@ -0,0 +1,73 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import discord
+import pytest
+
+from src.db.models import Channel
+from src.services.channel import ChannelService
+
+
+def test_has_unscanned_messages_when_never_scanned():
+    discord_channel = Mock(last_message_id=discord.utils.time_snowflake(discord.utils.utcnow()))
+    db_channel = Channel(id=1, guild_id=1, name="test", scanned_up_to=None)
+    assert ChannelService.has_unscanned_messages(discord_channel, db_channel)
+
+
+def test_has_unscanned_messages_when_newer_message_exists():
+    now = discord.utils.utcnow()
+    discord_channel = Mock(last_message_id=discord.utils.time_snowflake(now))
+    db_channel = Channel(id=1, guild_id=1, name="test", scanned_up_to=now - timedelta(minutes=1))
+    assert ChannelService.has_unscanned_messages(discord_channel, db_channel)
+
+
+def test_has_no_unscanned_messages_when_up_to_date():
+    now = discord.utils.utcnow()
+    discord_channel = Mock(last_message_id=discord.utils.time_snowflake(now))
+    db_channel = Channel(id=1, guild_id=1, name="test", scanned_up_to=now)
+    assert not ChannelService.has_unscanned_messages(discord_channel, db_channel)
+
+
+def _history(*messages: Mock, error: Exception = None):
+    async def history():
+        for message in messages:
+            yield message
+        if error is not None:
+            raise error
+
+    return history()
+
+
+async def test_import_history_marks_first_scan_only_when_finished(monkeypatch):
+    monkeypatch.setattr("src.services.message.MessageService.sync", AsyncMock())
+    now = discord.utils.utcnow()
+    messages = [Mock(created_at=now), Mock(created_at=now - timedelta(minutes=1))]
+    db_channel = Channel(id=1, guild_id=1, name="test", scanned_up_to=None)
+
+    await ChannelService(AsyncMock()).import_history(db_channel, _history(*messages))
+
+    assert db_channel.scanned_up_to == now
+
+
+async def test_import_history_interrupted_first_scan_stays_unscanned(monkeypatch):
+    monkeypatch.setattr("src.services.message.MessageService.sync", AsyncMock())
+    now = discord.utils.utcnow()
+    forbidden = discord.Forbidden(Mock(status=403, reason="Forbidden"), "Missing Access")
+    db_channel = Channel(id=1, guild_id=1, name="test", scanned_up_to=None)
+
+    await ChannelService(AsyncMock()).import_history(db_channel, _history(Mock(created_at=now), error=forbidden))
+
+    assert db_channel.scanned_up_to is None
+
+
+async def test_import_history_advances_later_scans_per_message(monkeypatch):
+    now = discord.utils.utcnow()
+    db_channel = Channel(id=1, guild_id=1, name="test", scanned_up_to=now - timedelta(minutes=2))
+    sync = AsyncMock(side_effect=[None, RuntimeError("database unavailable")])
+    monkeypatch.setattr("src.services.message.MessageService.sync", sync)
+    messages = [Mock(created_at=now - timedelta(minutes=1)), Mock(created_at=now)]
+
+    with pytest.raises(RuntimeError):
+        await ChannelService(AsyncMock()).import_history(db_channel, _history(*messages))
+
+    assert db_channel.scanned_up_to == now - timedelta(minutes=1)
@@ -1,4 +1,4 @@
-from src.util import drop_both_ends
+from src.util import drop_both_ends, find_mentions, mention_pattern
 
 
 def test_drop_both_ends_drops():
@@ -19,3 +19,23 @@ def test_drop_both_ends_leaves_empty():
 
 def test_drop_both_ends_removes_all():
     assert drop_both_ends(lambda x: x == 0, [0, 0, 0, 0]) == []
+
+
+def test_find_mentions_ignores_case():
+    assert find_mentions(["Nexari", "Other"], "hi @NEXARI") == {"Nexari"}
+
+
+def test_find_mentions_requires_at_sign():
+    assert find_mentions(["Nexari"], "hi nexari") == set()
+
+
+def test_find_mentions_finds_overlapping_names():
+    assert find_mentions(["bob", "bobby", "alice"], "@bobby and @alice") == {"bob", "bobby", "alice"}
+
+
+def test_find_mentions_escapes_names():
+    assert find_mentions(["a.b", "a+"], "@axb @a+") == {"a+"}
+
+
+def test_mention_pattern_is_cached():
+    assert mention_pattern(("a", "b")) is mention_pattern(("a", "b"))